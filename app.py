@@ -1,23 +1,184 @@
+import math
+import os
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 import dash
-from dash import dcc, html, Input, Output, dash_table
+from dash import dcc, html, Input, Output, State, ClientsideFunction, dash_table
 import plotly.express as px
+import plotly.io as pio
+from flask_compress import Compress
+
+# Serialize figures with orjson instead of the stdlib json encoder
+pio.json.config.default_engine = "orjson"
+
+DATA_CSV = "news article_with_coordinates.csv"
+DATA_PARQUET = "news article_with_coordinates.parquet"
+
+
+def load_data(csv_path=DATA_CSV, parquet_path=DATA_PARQUET):
+    """Load the cleaned articles, using a Parquet cache of the parsed CSV."""
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        return pd.read_parquet(parquet_path, engine="pyarrow", memory_map=True)
+
+    data = pd.read_csv(csv_path, encoding="ISO-8859-1", engine="pyarrow")
+    data["publish_date"] = pd.to_datetime(data["publish_date"], errors="coerce")
+    data.dropna(subset=["publish_date", "category", "counties", "media"], inplace=True)
+    data["publish_date_only"] = data["publish_date"].dt.date
+    for col in ("latitude", "longitude"):
+        data[col] = pd.to_numeric(data[col], errors="coerce", downcast="float")
+    data.to_parquet(parquet_path, engine="pyarrow", compression="zstd")
+    return data
+
+
+# Load data, sorted by date so date ranges can be sliced with searchsorted
+df = load_data().sort_values("publish_date", kind="stable").reset_index(drop=True)
 
-# Load data
-df = pd.read_csv("news article_with_coordinates.csv", encoding="ISO-8859-1")
-df["publish_date"] = pd.to_datetime(df["publish_date"], errors="coerce")
-df.dropna(subset=["publish_date", "category", "counties", "media"], inplace=True)
-df["publish_date_only"] = df["publish_date"].dt.date
+# Low-cardinality text columns as categoricals so isin/value_counts work on codes
+for col in ("category", "counties", "media"):
+    df[col] = df[col].astype("category")
+
+# Keep only the columns the dashboard uses, with the table's date text and title link built once.
+# df is not modified after this, so callbacks slice it without copying.
+df["publish_date_str"] = df["publish_date"].dt.strftime("%Y-%m-%d")
+df["title_link"] = "[" + df["title"].astype(str) + "](" + df["url"].astype(str) + ")"
+df = df[["publish_date", "publish_date_only", "publish_date_str", "category", "counties", "media", "title_link"]]
+PUBLISH_DATES = df["publish_date"].to_numpy()
+
+# Dropdown options from the (sorted, deduplicated) categories
+CATEGORY_OPTIONS = [{"label": cat, "value": cat} for cat in df["category"].cat.categories]
+COUNTY_OPTIONS = [{"label": county, "value": county} for county in df["counties"].cat.categories]
 
 # Initialize app
 app = dash.Dash(__name__)
 app.title = "Hazard News Dashboard"
 
+# Compress layout and callback JSON responses
+app.server.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.server.config["COMPRESS_MIN_SIZE"] = 500
+Compress(app.server)
+
+# Dashboard outputs
+def observed_counts(series):
+    """value_counts() without the zero rows reported for unused categories."""
+    counts = series.value_counts()
+    return counts[counts > 0]
+
+
+def build_dashboard(filtered_df):
+    """Build the media count text and figures for a filtered frame."""
+    # Media count
+    media_count = filtered_df["media"].nunique()
+    media_text = f"Number of unique news medias: {media_count}"
+
+    # Bar Chart: Number of Articles per Hazard
+    cat_counts = observed_counts(filtered_df["category"]).reset_index()
+    cat_counts.columns = ["category", "count"]
+    bar = px.bar(
+        cat_counts,
+        x="category",
+        y="count",
+        title="Number of Articles per Hazard Type",
+        color="category",
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+
+    # Pie Chart: Top 10 Counties by Total Reported Hazards (article counts)
+    county_counts = observed_counts(filtered_df["counties"])
+    top_county_counts = county_counts.nlargest(10).reset_index()
+    top_county_counts.columns = ["counties", "article_count"]
+    pie = px.pie(
+        top_county_counts,
+        names="counties",
+        values="article_count",
+        title="Top 10 Counties by Highest Reported Hazard",
+        color_discrete_sequence=px.colors.sequential.RdBu
+    )
+
+    # Line Plot: Time Series by Top 5 Counties
+    top_5_counties = county_counts.nlargest(5).index.tolist()
+    line_df = filtered_df[filtered_df["counties"].isin(top_5_counties)]
+    line_data = line_df.groupby(["publish_date_only", "counties"], observed=True).size().reset_index(name="article_count")
+    line = px.line(
+        line_data,
+        x="publish_date_only",
+        y="article_count",
+        color="counties",
+        title="Top 5 Active Counties",
+        labels={"publish_date_only": "Date", "article_count": "Number of Articles"},
+        color_discrete_sequence=px.colors.qualitative.Set2,
+        render_mode="webgl"
+    )
+
+    return media_text, pie, line, bar
+
+
+def build_table_page(positions, page_current, page_size):
+    """Format one page of the news table from the row positions to show."""
+    start = page_current * page_size
+    return df.iloc[positions[start:start + page_size]][[
+        "publish_date_str", "title_link", "counties", "category", "media"
+    ]].to_dict("records")
+
+
+@lru_cache(maxsize=256)
+def parse_date(date_str):
+    """Parse an ISO date string from the date picker."""
+    return np.datetime64(date_str, "ns")
+
+
+def filter_articles(selected_categories, selected_counties, start_date, end_date):
+    """Return the articles matching the dropdown and date range filters."""
+    filtered_df = df
+
+    if start_date and end_date:
+        lo = np.searchsorted(PUBLISH_DATES, parse_date(start_date))
+        hi = np.searchsorted(PUBLISH_DATES, parse_date(end_date), side="right")
+        filtered_df = filtered_df.iloc[lo:hi]
+    if selected_categories:
+        filtered_df = filtered_df[filtered_df["category"].isin(selected_categories)]
+    if selected_counties:
+        filtered_df = filtered_df[filtered_df["counties"].isin(selected_counties)]
+
+    return filtered_df
+
+
+@lru_cache(maxsize=64)
+def table_positions(selected_categories, selected_counties, start_date, end_date):
+    """Row positions of the filtered articles, newest first, so paging skips the filter and sort."""
+    filtered_df = filter_articles(list(selected_categories), list(selected_counties), start_date, end_date)
+    # df has a RangeIndex and is sorted by date, so reversing the index gives newest first
+    return filtered_df.index.to_numpy()[::-1]
+
+
+# The server renders the unfiltered figures; filter changes are redrawn in the
+# browser by assets/dashboard.js from ARTICLES_STORE
+BASE_MEDIA_TEXT, BASE_PIE, BASE_LINE, BASE_BAR = build_dashboard(df)
+
+# Columnar, dictionary-encoded articles for the clientside callback. Rows are in
+# date order, so each date is sent once with the position of its first row.
+DATE_NAMES, DATE_STARTS = np.unique(df["publish_date_str"].to_numpy(), return_index=True)
+ARTICLES_STORE = {
+    "date_names": DATE_NAMES.tolist(),
+    "date_starts": DATE_STARTS.tolist(),
+    "category_codes": df["category"].cat.codes.tolist(),
+    "category_names": df["category"].cat.categories.tolist(),
+    "county_codes": df["counties"].cat.codes.tolist(),
+    "county_names": df["counties"].cat.categories.tolist(),
+    "media_codes": df["media"].cat.codes.tolist(),
+    "colors": px.colors.qualitative.Set2,
+}
+
+
 # Layout
 app.layout = html.Div(style={"font-family": "Arial, sans-serif", "padding": "20px"}, children=[
     html.H1("UK Hazard Intelligence Dashboard", style={"textAlign": "center", "color": "#2c3e50"}),
 
-    html.Div(id="media-count", style={
+    # Articles for the clientside figure updates
+    dcc.Store(id="articles-store", storage_type="memory", data=ARTICLES_STORE),
+
+    html.Div(BASE_MEDIA_TEXT, id="media-count", style={
         "textAlign": "center",
         "fontSize": "18px",
         "color": "#34495e",
@@ -30,7 +191,7 @@ app.layout = html.Div(style={"font-family": "Arial, sans-serif", "padding": "20p
             html.Label("Select Hazard Category:", style={"fontWeight": "bold"}),
             dcc.Dropdown(
                 id="category-dropdown",
-                options=[{"label": cat, "value": cat} for cat in sorted(df["category"].unique())],
+                options=CATEGORY_OPTIONS,
                 value=None,
                 placeholder="All categories",
                 multi=True
@@ -41,7 +202,7 @@ app.layout = html.Div(style={"font-family": "Arial, sans-serif", "padding": "20p
             html.Label("Select County:", style={"fontWeight": "bold"}),
             dcc.Dropdown(
                 id="county-dropdown",
-                options=[{"label": county, "value": county} for county in sorted(df["counties"].unique())],
+                options=COUNTY_OPTIONS,
                 value=None,
                 placeholder="All counties",
                 multi=True
@@ -61,17 +222,17 @@ app.layout = html.Div(style={"font-family": "Arial, sans-serif", "padding": "20p
 
     # Bar Chart
     html.Div([
-        dcc.Graph(id="bar-category-counts")
+        dcc.Graph(id="bar-category-counts", figure=BASE_BAR)
     ], style={"marginBottom": "40px"}),
 
     # Pie + Line Plot
     html.Div([
         html.Div([
-            dcc.Graph(id="pie-media-by-county")
+            dcc.Graph(id="pie-media-by-county", figure=BASE_PIE)
         ], style={"width": "49%", "display": "inline-block", "paddingRight": "1%"}),
 
         html.Div([
-            dcc.Graph(id="line-county-time-series")
+            dcc.Graph(id="line-county-time-series", figure=BASE_LINE)
         ], style={"width": "49%", "display": "inline-block"}),
     ], style={"marginBottom": "40px"}),
 
@@ -81,12 +242,14 @@ app.layout = html.Div(style={"font-family": "Arial, sans-serif", "padding": "20p
     dash_table.DataTable(
         id="news-table",
         columns=[
-            {"name": "Published Date", "id": "publish_date"},
+            {"name": "Published Date", "id": "publish_date_str"},
             {"name": "Title", "id": "title_link", "presentation": "markdown"},
             {"name": "County", "id": "counties"},
             {"name": "Category", "id": "category"},
             {"name": "Media", "id": "media"},
         ],
+        page_action="custom",
+        page_current=0,
         page_size=20,
         style_table={"overflowX": "auto", "border": "1px solid #ccc", "borderRadius": "8px"},
         style_cell={
@@ -113,83 +276,55 @@ app.layout = html.Div(style={"font-family": "Arial, sans-serif", "padding": "20p
     )
 ])
 
-# Callback
-@app.callback(
+# Callbacks
+app.clientside_callback(
+    ClientsideFunction(namespace="dashboard", function_name="update_figures"),
     Output("media-count", "children"),
     Output("pie-media-by-county", "figure"),
     Output("line-county-time-series", "figure"),
     Output("bar-category-counts", "figure"),
-    Output("news-table", "data"),
     Input("category-dropdown", "value"),
     Input("county-dropdown", "value"),
     Input("date-range-picker", "start_date"),
     Input("date-range-picker", "end_date"),
+    State("articles-store", "data"),
+    State("pie-media-by-county", "figure"),
+    State("line-county-time-series", "figure"),
+    State("bar-category-counts", "figure"),
+    prevent_initial_call=True,
 )
-def update_dashboard(selected_categories, selected_counties, start_date, end_date):
-    filtered_df = df.copy()
-
-    if selected_categories:
-        filtered_df = filtered_df[filtered_df["category"].isin(selected_categories)]
-    if selected_counties:
-        filtered_df = filtered_df[filtered_df["counties"].isin(selected_counties)]
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df["publish_date"] >= pd.to_datetime(start_date)) &
-            (filtered_df["publish_date"] <= pd.to_datetime(end_date))
-        ]
-
-    # Media count
-    media_count = filtered_df["media"].nunique()
-    media_text = f"Number of unique news medias: {media_count}"
 
-    # Bar Chart: Number of Articles per Hazard
-    cat_counts = filtered_df["category"].value_counts().reset_index()
-    cat_counts.columns = ["category", "count"]
-    bar = px.bar(
-        cat_counts,
-        x="category",
-        y="count",
-        title="Number of Articles per Hazard Type",
-        color="category",
-        color_discrete_sequence=px.colors.qualitative.Set2
-    )
 
-    # Pie Chart: Top 10 Counties by Total Reported Hazards (article counts)
-    top_county_counts = filtered_df["counties"].value_counts().nlargest(10).reset_index()
-    top_county_counts.columns = ["counties", "article_count"]
-    pie = px.pie(
-        top_county_counts,
-        names="counties",
-        values="article_count",
-        title="Top 10 Counties by Highest Reported Hazard",
-        color_discrete_sequence=px.colors.sequential.RdBu
-    )
+@app.callback(
+    Output("news-table", "page_current"),
+    Input("category-dropdown", "value"),
+    Input("county-dropdown", "value"),
+    Input("date-range-picker", "start_date"),
+    Input("date-range-picker", "end_date"),
+)
+def reset_table_page(selected_categories, selected_counties, start_date, end_date):
+    return 0
 
-    # Line Plot: Time Series by Top 5 Counties
-    top_5_counties = filtered_df["counties"].value_counts().nlargest(5).index.tolist()
-    line_df = filtered_df[filtered_df["counties"].isin(top_5_counties)]
-    line_data = line_df.groupby(["publish_date_only", "counties"]).size().reset_index(name="article_count")
-    line = px.line(
-        line_data,
-        x="publish_date_only",
-        y="article_count",
-        color="counties",
-        title="Top 5 Active Counties",
-        labels={"publish_date_only": "Date", "article_count": "Number of Articles"},
-        color_discrete_sequence=px.colors.qualitative.Set2
-    )
 
-    # Format news table
-    filtered_df = filtered_df.sort_values("publish_date", ascending=False).copy()
-    filtered_df["publish_date"] = filtered_df["publish_date"].dt.strftime("%Y-%m-%d")
-    filtered_df["title_link"] = filtered_df.apply(
-        lambda row: f"[{row['title']}]({row['url']})", axis=1
+@app.callback(
+    Output("news-table", "data"),
+    Output("news-table", "page_count"),
+    Input("category-dropdown", "value"),
+    Input("county-dropdown", "value"),
+    Input("date-range-picker", "start_date"),
+    Input("date-range-picker", "end_date"),
+    Input("news-table", "page_current"),
+    Input("news-table", "page_size"),
+)
+def update_table(selected_categories, selected_counties, start_date, end_date, page_current, page_size):
+    positions = table_positions(
+        tuple(sorted(selected_categories or ())),
+        tuple(sorted(selected_counties or ())),
+        start_date,
+        end_date,
     )
-    table_data = filtered_df[[
-        "publish_date", "title_link", "counties", "category", "media"
-    ]].to_dict("records")
-
-    return media_text, pie, line, bar, table_data
+    page_count = max(1, math.ceil(len(positions) / page_size))
+    return build_table_page(positions, page_current or 0, page_size), page_count
 
 # Run the app locally
 if __name__ == '__main__':
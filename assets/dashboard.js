@@ -0,0 +1,167 @@
+// Clientside version of build_dashboard() in app.py: filters the articles
+// store and redraws the media count and the three figures in the browser.
+
+(function () {
+    "use strict";
+
+    // Article counts per code for the given rows.
+    function countCodes(codes, rows, size) {
+        const counts = new Array(size).fill(0);
+        rows.forEach(function (i) { counts[codes[i]] += 1; });
+        return counts;
+    }
+
+    // Codes with at least one article, most articles first (ties by code, like
+    // pandas value_counts on a categorical).
+    function rankCodes(counts) {
+        const ranked = [];
+        counts.forEach(function (count, code) {
+            if (count > 0) {
+                ranked.push(code);
+            }
+        });
+        return ranked.sort(function (a, b) { return counts[b] - counts[a] || a - b; });
+    }
+
+    // Index of the first name >= value (or > value when right is set).
+    function bisect(names, value, right) {
+        let lo = 0;
+        let hi = names.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (names[mid] < value || (right && names[mid] === value)) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
+            }
+        }
+        return lo;
+    }
+
+    function namedCodes(names, selected) {
+        return selected && selected.length ? new Set(selected.map(function (name) { return names.indexOf(name); })) : null;
+    }
+
+    function updateFigures(selectedCategories, selectedCounties, startDate, endDate, articles, pie, line, bar) {
+        const categories = namedCodes(articles.category_names, selectedCategories);
+        const counties = namedCodes(articles.county_names, selectedCounties);
+        const dateNames = articles.date_names;
+        const dateStarts = articles.date_starts;
+        const colors = articles.colors;
+
+        // Rows are grouped by date, so the date range is a contiguous run of dates
+        let firstDate = 0;
+        let lastDate = dateNames.length;
+        if (startDate && endDate) {
+            firstDate = bisect(dateNames, startDate.slice(0, 10), false);
+            lastDate = bisect(dateNames, endDate.slice(0, 10), true);
+        }
+
+        const rows = [];
+        const rowDates = [];
+        for (let d = firstDate; d < lastDate; d++) {
+            const stop = d + 1 < dateNames.length ? dateStarts[d + 1] : articles.category_codes.length;
+            for (let i = dateStarts[d]; i < stop; i++) {
+                if (categories && !categories.has(articles.category_codes[i])) {
+                    continue;
+                }
+                if (counties && !counties.has(articles.county_codes[i])) {
+                    continue;
+                }
+                rows.push(i);
+                rowDates.push(dateNames[d]);
+            }
+        }
+
+        // Media count
+        const media = new Set(rows.map(function (i) { return articles.media_codes[i]; }));
+        const mediaText = "Number of unique news medias: " + media.size;
+
+        // Bar Chart: Number of Articles per Hazard
+        const categoryCounts = countCodes(articles.category_codes, rows, articles.category_names.length);
+        const rankedCategories = rankCodes(categoryCounts);
+        const categoryNames = rankedCategories.map(function (code) { return articles.category_names[code]; });
+        const barData = rankedCategories.map(function (code, k) {
+            const name = articles.category_names[code];
+            return {
+                type: "bar",
+                x: [name],
+                y: [categoryCounts[code]],
+                name: name,
+                legendgroup: name,
+                marker: {color: colors[k % colors.length], pattern: {shape: ""}},
+                orientation: "v",
+                showlegend: true,
+                textposition: "auto",
+                xaxis: "x",
+                yaxis: "y",
+                hovertemplate: "category=%{x}<br>count=%{y}<extra></extra>"
+            };
+        });
+        const barLayout = Object.assign({}, bar.layout, {
+            xaxis: Object.assign({}, bar.layout.xaxis, {categoryarray: categoryNames})
+        });
+
+        // Pie Chart: Top 10 Counties by Total Reported Hazards (article counts)
+        const countyCounts = countCodes(articles.county_codes, rows, articles.county_names.length);
+        const rankedCounties = rankCodes(countyCounts);
+        const topCounties = rankedCounties.slice(0, 10);
+        const pieData = [{
+            type: "pie",
+            labels: topCounties.map(function (code) { return articles.county_names[code]; }),
+            values: topCounties.map(function (code) { return countyCounts[code]; }),
+            domain: {x: [0.0, 1.0], y: [0.0, 1.0]},
+            name: "",
+            legendgroup: "",
+            showlegend: true,
+            hovertemplate: "counties=%{label}<br>article_count=%{value}<extra></extra>"
+        }];
+
+        // Line Plot: Time Series by Top 5 Counties, one trace per county in order
+        // of first appearance (rows are already in date order)
+        const series = new Map();
+        rankedCounties.slice(0, 5).forEach(function (code) { series.set(code, new Map()); });
+        rows.forEach(function (i, k) {
+            const byDate = series.get(articles.county_codes[i]);
+            if (byDate) {
+                byDate.set(rowDates[k], (byDate.get(rowDates[k]) || 0) + 1);
+            }
+        });
+        const lineCodes = Array.from(series.keys()).sort(function (a, b) {
+            const firstA = series.get(a).keys().next().value;
+            const firstB = series.get(b).keys().next().value;
+            return firstA < firstB ? -1 : firstA > firstB ? 1 : a - b;
+        });
+        const lineData = lineCodes.map(function (code, k) {
+            const name = articles.county_names[code];
+            const byDate = series.get(code);
+            return {
+                type: "scattergl",
+                mode: "lines",
+                x: Array.from(byDate.keys()),
+                y: Array.from(byDate.values()),
+                name: name,
+                legendgroup: name,
+                line: {color: colors[k % colors.length], dash: "solid"},
+                marker: {symbol: "circle"},
+                showlegend: true,
+                xaxis: "x",
+                yaxis: "y",
+                hovertemplate: "counties=" + name + "<br>Date=%{x}<br>Number of Articles=%{y}<extra></extra>"
+            };
+        });
+
+        return [
+            mediaText,
+            {data: pieData, layout: pie.layout},
+            {data: lineData, layout: line.layout},
+            {data: barData, layout: barLayout}
+        ];
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        dashboard: {
+            update_figures: updateFigures
+        }
+    });
+})();